@@ -6,7 +6,18 @@ from sqlmodel import Session, create_engine
 from app.core.config import settings
 
 # Create database engine
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+# Pool is sized for worker concurrency; pre-ping stays off so checkouts
+# don't pay an extra SELECT 1 round-trip, with pool_recycle bounding how
+# stale a pooled connection can get. LIFO checkout keeps hot connections
+# hotter for better reuse.
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    pool_size=20,
+    max_overflow=40,
+    pool_pre_ping=False,
+    pool_recycle=1800,
+    pool_use_lifo=True,
+)
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
 # otherwise, SQLModel might fail to initialize relationships properly
@@ -28,6 +28,11 @@ class TokenEncryption:
     - HMAC-SHA256 authentication
     - Automatic IV generation
     - Timestamp for key rotation (optional)
+
+    Fernet decodes the base64 key and splits it into signing/encryption
+    halves at construction time. Hot paths must therefore go through
+    get_encryption() (a cached singleton) so that cost is paid once per
+    process rather than per encrypt/decrypt call.
     """
 
     def __init__(self, key: str | None = None):
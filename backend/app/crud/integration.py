@@ -7,6 +7,7 @@ for external services (Google Drive, Dataverse, etc.).
 
 from datetime import datetime, timezone, timedelta
 
+from sqlalchemy import update
 from sqlmodel import Session, select
 
 from app.core.encryption import get_encryption
@@ -130,6 +131,79 @@ def create_or_update_integration(
     return integration
 
 
+def finalize_refresh(
+    *,
+    session: Session,
+    integration_id: int,
+    access_token: str,
+    refresh_token: str | None = None,
+    expires_in: int | None = None,
+    scopes: str | None = None,
+) -> datetime | None:
+    """
+    Persist refreshed tokens and clear the refresh lock in one UPDATE.
+
+    Fuses the read-modify-write cycle after a token refresh (fetch,
+    mutate, commit, re-fetch to clear the lock) into a single statement
+    with RETURNING, saving two round-trips and closing the window where
+    the lock is held with the new token already stored.
+
+    Args:
+        session: Database session
+        integration_id: ID of the integration to update
+        access_token: New OAuth access token (will be encrypted)
+        refresh_token: New OAuth refresh token (will be encrypted, optional)
+        expires_in: Token lifetime in seconds (optional)
+        scopes: Space-separated OAuth scopes (optional)
+
+    Returns:
+        The new expires_at value, or None if the row no longer exists
+    """
+    encryption = get_encryption()
+
+    now = datetime.now(timezone.utc)
+    expires_at = None
+    if expires_in is not None:
+        expires_at = now + timedelta(seconds=expires_in)
+
+    values: dict = {
+        "access_token_encrypted": encryption.encrypt(access_token),
+        "expires_at": expires_at,
+        "scopes": scopes,
+        "refresh_locked_at": None,
+        "updated_at": now,
+    }
+    if refresh_token is not None:
+        values["refresh_token_encrypted"] = encryption.encrypt(refresh_token)
+
+    statement = (
+        update(UserIntegration)
+        .where(UserIntegration.id == integration_id)  # type: ignore[arg-type]
+        .values(**values)
+        .returning(UserIntegration.expires_at)  # type: ignore[arg-type]
+    )
+    result = session.execute(statement).first()
+    session.commit()
+    return result[0] if result else None
+
+
+def clear_refresh_lock(*, session: Session, integration_id: int) -> None:
+    """
+    Clear the refresh lock in a single UPDATE, without re-fetching the row.
+
+    Args:
+        session: Database session
+        integration_id: ID of the integration to unlock
+    """
+    statement = (
+        update(UserIntegration)
+        .where(UserIntegration.id == integration_id)  # type: ignore[arg-type]
+        .values(refresh_locked_at=None)
+    )
+    session.execute(statement)
+    session.commit()
+
+
 def delete_integration(
     *, session: Session, user_id: int, service_name: str
 ) -> bool:
@@ -181,6 +255,33 @@ def get_decrypted_tokens(integration: UserIntegration) -> dict[str, str | None]:
     }
 
 
+def get_expiring_integrations(
+    *,
+    session: Session,
+    within_minutes: int,
+) -> list[UserIntegration]:
+    """
+    Get all integrations whose tokens expire within the given window.
+
+    Only returns integrations that have a refresh token, since those are
+    the only ones a background refresh can act on.
+
+    Args:
+        session: Database session
+        within_minutes: Look-ahead window in minutes
+
+    Returns:
+        List of UserIntegration objects expiring within the window
+    """
+    cutoff = datetime.now(timezone.utc) + timedelta(minutes=within_minutes)
+    statement = select(UserIntegration).where(
+        UserIntegration.expires_at.is_not(None),  # type: ignore[union-attr]
+        UserIntegration.expires_at < cutoff,
+        UserIntegration.refresh_token_encrypted.is_not(None),  # type: ignore[union-attr]
+    )
+    return list(session.exec(statement).all())
+
+
 def get_missing_integrations(
     *,
     session: Session,
@@ -32,6 +32,8 @@ from app.core.middleware import RequestLoggingMiddleware
 from app.graphql_api.schema import schema
 from app.graphql_api.loaders import create_loaders
 from app.services.oauth_state_cleanup import run_cleanup_task
+from app.services.oauth_token import close_http_client
+from app.services.token_refresh import run_refresh_sweeper_task
 
 # Setup logging before anything else
 setup_logging()
@@ -65,18 +67,30 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         )
     )
 
+    # Start background sweeper that proactively refreshes expiring tokens
+    sweeper_task = asyncio.create_task(
+        run_refresh_sweeper_task(
+            get_session=get_session,
+            stop_event=stop_event,
+        )
+    )
+
     yield
 
     # Shutdown
     logger.info(f"{settings.PROJECT_NAME} - Shutting Down")
 
-    # Stop the cleanup task gracefully
+    # Stop the background tasks gracefully
     stop_event.set()
-    cleanup_task.cancel()
-    try:
-        await cleanup_task
-    except asyncio.CancelledError:
-        pass
+    for task in (cleanup_task, sweeper_task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    # Close the pooled OAuth HTTP client
+    await close_http_client()
 
 
 # GraphQL context using FastAPI dependency injection
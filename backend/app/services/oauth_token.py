@@ -5,10 +5,27 @@ Handles exchanging authorization codes for tokens and refreshing expired tokens.
 """
 
 import httpx
+from pydantic import BaseModel, ValidationError
 
 from app.services.oauth_config import get_provider_config
 
 
+class TokenResponse(BaseModel):
+    """
+    Parsed OAuth token endpoint response.
+
+    Validated directly from the raw response bytes via Pydantic's
+    Rust-backed JSON parser, which is faster than stdlib json and gives
+    typed attribute access downstream. Unknown provider fields are ignored.
+    """
+
+    access_token: str
+    refresh_token: str | None = None
+    expires_in: int | None = None
+    token_type: str = "Bearer"
+    scope: str | None = None
+
+
 class OAuthTokenError(Exception):
     """Error during OAuth token exchange or refresh."""
 
@@ -18,7 +35,37 @@ class OAuthTokenError(Exception):
         super().__init__(f"{error}: {description}" if description else error)
 
 
-async def _post_token_request(token_url: str, data: dict) -> dict:
+# Shared HTTP client so token requests reuse pooled TCP/TLS connections
+# instead of paying a full handshake per exchange/refresh call.
+# Created lazily on first use; closed from the FastAPI lifespan shutdown hook.
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared AsyncClient used for token endpoint requests.
+
+    Returns:
+        The module-level httpx.AsyncClient, creating it if needed.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=50),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared AsyncClient. Called on application shutdown."""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+
+async def _post_token_request(token_url: str, data: dict) -> TokenResponse:
     """
     Make a POST request to an OAuth token endpoint.
 
@@ -27,17 +74,17 @@ async def _post_token_request(token_url: str, data: dict) -> dict:
         data: Form data to send with the request
 
     Returns:
-        Parsed JSON response from the token endpoint
+        Validated TokenResponse parsed from the token endpoint response
 
     Raises:
         OAuthTokenError: If the token request fails
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(
-            token_url,
-            data=data,
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-        )
+    client = get_http_client()
+    response = await client.post(
+        token_url,
+        data=data,
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
 
     # Handle non-200 status codes with graceful JSON parsing
     if response.status_code != 200:
@@ -51,17 +98,15 @@ async def _post_token_request(token_url: str, data: dict) -> dict:
             description = f"HTTP {response.status_code}: {response.text[:200]}"
         raise OAuthTokenError(error, description)
 
-    # Parse successful response
+    # Parse and validate successful response in one pass from the raw bytes
     try:
-        result = response.json()
-    except (ValueError, TypeError) as e:
+        return TokenResponse.model_validate_json(response.content)
+    except ValidationError as e:
         raise OAuthTokenError(
             "invalid_response",
             f"Failed to parse token response as JSON: {e}",
         )
 
-    return result
-
 
 async def exchange_code_for_tokens(
     service_name: str,
@@ -115,11 +160,11 @@ async def exchange_code_for_tokens(
     result = await _post_token_request(config.token_url, data)
 
     return {
-        "access_token": result["access_token"],
-        "refresh_token": result.get("refresh_token"),
-        "expires_in": result.get("expires_in"),
-        "token_type": result.get("token_type", "Bearer"),
-        "scope": result.get("scope"),
+        "access_token": result.access_token,
+        "refresh_token": result.refresh_token,
+        "expires_in": result.expires_in,
+        "token_type": result.token_type,
+        "scope": result.scope,
     }
 
 
@@ -166,11 +211,11 @@ async def refresh_access_token(
     result = await _post_token_request(config.token_url, data)
 
     return {
-        "access_token": result["access_token"],
+        "access_token": result.access_token,
         # Some providers don't return a new refresh token on refresh
         # In that case, preserve the original
-        "refresh_token": result.get("refresh_token", refresh_token),
-        "expires_in": result.get("expires_in"),
-        "token_type": result.get("token_type", "Bearer"),
-        "scope": result.get("scope"),
+        "refresh_token": result.refresh_token or refresh_token,
+        "expires_in": result.expires_in,
+        "token_type": result.token_type,
+        "scope": result.scope,
     }
@@ -13,14 +13,18 @@ Includes protection against:
 - Rate limiting: Minimum interval between refresh attempts
 """
 
+import asyncio
 import logging
+import weakref
 from datetime import datetime, timedelta, timezone
 from cryptography.fernet import InvalidToken
 from sqlmodel import Session
 
 from app.crud.integration import (
-    create_or_update_integration,
+    clear_refresh_lock,
+    finalize_refresh,
     get_decrypted_tokens,
+    get_expiring_integrations,
     get_user_integration,
 )
 from app.services.oauth_token import refresh_access_token, OAuthTokenError
@@ -45,6 +49,38 @@ REFRESH_LOCK_TIMEOUT_SECONDS = 30
 # Prevents rapid polling from overloading OAuth providers
 RATE_LIMIT_SECONDS = 60
 
+# Background sweeper configuration
+# The sweeper proactively refreshes tokens nearing expiry so bursts of
+# per-request refreshes don't pile up at access-token TTL boundaries
+REFRESH_SWEEP_INTERVAL_SECONDS = 30
+
+# In-process locks keyed by (user_id, service_name).
+# The DB lock (refresh_locked_at) guards cross-process races; these locks
+# coalesce concurrent coroutines within a single worker so only one reaches
+# the database, instead of each paying a round-trip just to discover the
+# DB lock is held. Values are weak: once no coroutine holds a lock, its
+# entry disappears, so the dict is bounded by concurrently active pairs
+# rather than growing with every pair ever seen.
+_refresh_locks: "weakref.WeakValueDictionary[tuple[int, str], asyncio.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _get_refresh_lock(user_id: int, service_name: str) -> asyncio.Lock:
+    """Get (or create) the in-process refresh lock for a (user, service) pair.
+
+    The caller must keep a strong reference to the returned lock for as
+    long as it needs it; the registry itself only holds a weak one.
+    """
+    key = (user_id, service_name)
+    lock = _refresh_locks.get(key)
+    if lock is None:
+        # Safe without further synchronization: the event loop runs this
+        # function without a suspension point between lookup and insert
+        lock = asyncio.Lock()
+        _refresh_locks[key] = lock
+    return lock
+
 
 def get_refresh_threshold_minutes(service_name: str) -> int:
     """
@@ -221,20 +257,6 @@ def _acquire_refresh_lock(session: Session, integration) -> bool:
     return True
 
 
-def _release_refresh_lock(session: Session, integration) -> None:
-    """
-    Release the refresh lock.
-
-    Args:
-        session: Database session
-        integration: UserIntegration object
-    """
-    integration.refresh_locked_at = None
-    session.add(integration)
-    session.commit()
-    session.refresh(integration)
-
-
 async def refresh_integration_token(
     *,
     session: Session,
@@ -256,6 +278,26 @@ async def refresh_integration_token(
     Returns:
         True if refresh succeeded, False otherwise (including when skipped due to lock/rate limit)
     """
+    # Coalesce concurrent refreshes within this worker: only one coroutine
+    # proceeds per (user, service); the rest wait here and then typically
+    # short-circuit on the rate-limit check below. The local keeps the
+    # weakly-registered lock alive while it is held or awaited.
+    lock = _get_refresh_lock(user_id, service_name)
+    async with lock:
+        return await _refresh_integration_token_locked(
+            session=session,
+            user_id=user_id,
+            service_name=service_name,
+        )
+
+
+async def _refresh_integration_token_locked(
+    *,
+    session: Session,
+    user_id: int,
+    service_name: str,
+) -> bool:
+    """Perform the actual refresh. Caller must hold the in-process lock."""
     integration = get_user_integration(
         session=session,
         user_id=user_id,
@@ -266,6 +308,14 @@ async def refresh_integration_token(
         logger.error("Cannot refresh: no integration found for %s", service_name)
         return False
 
+    # get_valid_token loads this integration before calling here, so for
+    # a coroutine that waited on the in-process lock the SELECT above
+    # returns the identity-mapped object with attributes from before the
+    # winner's commit. Expire it so the lock/rate-limit checks below read
+    # current rows and the waiter short-circuits instead of refreshing
+    # again.
+    session.expire(integration)
+
     # Check rate limiting first
     if _is_rate_limited(integration):
         logger.info(
@@ -301,49 +351,143 @@ async def refresh_integration_token(
             provider_client_id=integration.provider_client_id,
         )
 
-        # Update the stored integration (preserve provider_client_id)
-        create_or_update_integration(
+        # Store the new tokens and clear the lock in a single UPDATE
+        # (provider_client_id and token_type are left untouched)
+        finalize_refresh(
             session=session,
-            user_id=user_id,
-            service_name=service_name,
+            integration_id=integration.id,
             access_token=new_tokens["access_token"],
             refresh_token=new_tokens.get("refresh_token"),
             expires_in=new_tokens.get("expires_in"),
             scopes=new_tokens.get("scope"),
-            provider_client_id=integration.provider_client_id,
         )
 
-        # Clear the lock after successful refresh
-        # Re-fetch integration since create_or_update may have modified it
-        integration = get_user_integration(
-            session=session,
-            user_id=user_id,
-            service_name=service_name,
-        )
-        _release_refresh_lock(session, integration)
-
         logger.info("Successfully refreshed token for %s user %s", service_name, user_id)
         return True
 
     except OAuthTokenError as e:
         logger.error("Token refresh failed for %s: %s", service_name, e)
-        # Release lock on failure
-        integration = get_user_integration(
-            session=session,
-            user_id=user_id,
-            service_name=service_name,
-        )
-        if integration:
-            _release_refresh_lock(session, integration)
+        clear_refresh_lock(session=session, integration_id=integration.id)
         return False
     except Exception:
         logger.exception("Unexpected error refreshing token for %s", service_name)
-        # Release lock on failure
-        integration = get_user_integration(
-            session=session,
-            user_id=user_id,
-            service_name=service_name,
-        )
-        if integration:
-            _release_refresh_lock(session, integration)
+        clear_refresh_lock(session=session, integration_id=integration.id)
         return False
+
+
+async def sweep_expiring_tokens(*, session: Session) -> int:
+    """
+    Refresh all tokens that are expired or expiring within their threshold.
+
+    Selects candidate integrations in one query, then refreshes them
+    sequentially: SQLModel sessions are not safe for concurrent use, and
+    each refresh interleaves reads and commits on the shared session at
+    its await points. The win is the single candidate SELECT and the
+    pooled OAuth HTTP client; the per-request refresh path remains as a
+    safety net for anything the sweeper misses.
+
+    Args:
+        session: Database session
+
+    Returns:
+        Number of tokens successfully refreshed
+    """
+    # One SELECT covering the widest service threshold; per-service
+    # thresholds are applied below
+    horizon = max(
+        SERVICE_REFRESH_THRESHOLDS.values(),
+        default=DEFAULT_REFRESH_THRESHOLD_MINUTES,
+    )
+    candidates = get_expiring_integrations(session=session, within_minutes=horizon)
+
+    due = [
+        integration
+        for integration in candidates
+        if integration.is_expired()
+        or integration.is_expiring_soon(
+            minutes=get_refresh_threshold_minutes(integration.service_name)
+        )
+    ]
+
+    if not due:
+        return 0
+
+    refreshed = 0
+    for integration in due:
+        try:
+            if await refresh_integration_token(
+                session=session,
+                user_id=integration.user_id,
+                service_name=integration.service_name,
+            ):
+                refreshed += 1
+        except Exception:
+            logger.exception(
+                "Sweeper refresh raised for %s user %s",
+                integration.service_name,
+                integration.user_id,
+            )
+
+    logger.info(
+        "Token sweep: %d candidate(s), %d refreshed", len(due), refreshed
+    )
+    return refreshed
+
+
+async def run_refresh_sweeper_task(
+    *,
+    get_session,
+    interval_seconds: int = REFRESH_SWEEP_INTERVAL_SECONDS,
+    stop_event: asyncio.Event | None = None,
+) -> None:
+    """
+    Background task that periodically refreshes expiring tokens.
+
+    This task runs indefinitely until cancelled or stop_event is set.
+
+    Args:
+        get_session: Callable that returns a database session context manager
+        interval_seconds: Time between sweep runs
+        stop_event: Optional event to signal task shutdown
+    """
+    logger.info(
+        "Token refresh sweeper started (interval: %d seconds)",
+        interval_seconds,
+    )
+
+    while True:
+        try:
+            # Check if we should stop
+            if stop_event is not None and stop_event.is_set():
+                logger.info("Token refresh sweeper stopping (stop event set)")
+                break
+
+            # Wait for the interval (or until stop_event is set)
+            if stop_event is not None:
+                try:
+                    await asyncio.wait_for(
+                        stop_event.wait(),
+                        timeout=interval_seconds,
+                    )
+                    # If we get here, stop_event was set
+                    logger.info("Token refresh sweeper stopping (stop event set)")
+                    break
+                except asyncio.TimeoutError:
+                    # Timeout means interval elapsed, continue to sweep
+                    pass
+            else:
+                await asyncio.sleep(interval_seconds)
+
+            # Perform sweep
+            with get_session() as session:
+                await sweep_expiring_tokens(session=session)
+
+        except asyncio.CancelledError:
+            logger.info("Token refresh sweeper cancelled")
+            raise
+        except Exception:
+            logger.exception("Error in token refresh sweeper")
+            # Continue running despite errors
+            await asyncio.sleep(interval_seconds)
+
+    logger.info("Token refresh sweeper stopped")
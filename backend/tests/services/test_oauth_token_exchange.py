@@ -11,6 +11,8 @@ DATAVERSE_CLIENT_ID or DATAVERSE_CLIENT_SECRET are needed. The provider_client_i
 is passed to the exchange function for Dataverse.
 """
 
+import json
+
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 
@@ -33,13 +35,12 @@ class TestTokenExchange:
             "token_type": "Bearer",
             "scope": "https://www.googleapis.com/auth/drive.readonly",
         }
+        mock_response.content = json.dumps(mock_response.json.return_value).encode()
 
-        with patch("httpx.AsyncClient") as mock_client:
+        with patch("app.services.oauth_token.get_http_client") as mock_get_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
+            mock_get_client.return_value = mock_instance
 
             tokens = await exchange_code_for_tokens(
                 service_name="google_drive",
@@ -65,13 +66,12 @@ class TestTokenExchange:
             "expires_in": 7200,
             "token_type": "Bearer",
         }
+        mock_response.content = json.dumps(mock_response.json.return_value).encode()
 
-        with patch("httpx.AsyncClient") as mock_client:
+        with patch("app.services.oauth_token.get_http_client") as mock_get_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
+            mock_get_client.return_value = mock_instance
 
             tokens = await exchange_code_for_tokens(
                 service_name="dataverse",
@@ -102,13 +102,12 @@ class TestTokenExchange:
             "error": "invalid_grant",
             "error_description": "Code has expired",
         }
+        mock_response.content = json.dumps(mock_response.json.return_value).encode()
 
-        with patch("httpx.AsyncClient") as mock_client:
+        with patch("app.services.oauth_token.get_http_client") as mock_get_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
+            mock_get_client.return_value = mock_instance
 
             with pytest.raises(OAuthTokenError, match="invalid_grant"):
                 await exchange_code_for_tokens(
@@ -147,13 +146,12 @@ class TestTokenRefresh:
             "expires_in": 3600,
             "token_type": "Bearer",
         }
+        mock_response.content = json.dumps(mock_response.json.return_value).encode()
 
-        with patch("httpx.AsyncClient") as mock_client:
+        with patch("app.services.oauth_token.get_http_client") as mock_get_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
+            mock_get_client.return_value = mock_instance
 
             tokens = await refresh_access_token(
                 service_name="google_drive",
@@ -176,13 +174,12 @@ class TestTokenRefresh:
             "token_type": "Bearer",
             # No refresh_token - Google only returns it on first auth
         }
+        mock_response.content = json.dumps(mock_response.json.return_value).encode()
 
-        with patch("httpx.AsyncClient") as mock_client:
+        with patch("app.services.oauth_token.get_http_client") as mock_get_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
+            mock_get_client.return_value = mock_instance
 
             tokens = await refresh_access_token(
                 service_name="google_drive",
@@ -205,13 +202,12 @@ class TestTokenRefresh:
             "expires_in": 7200,
             "token_type": "Bearer",
         }
+        mock_response.content = json.dumps(mock_response.json.return_value).encode()
 
-        with patch("httpx.AsyncClient") as mock_client:
+        with patch("app.services.oauth_token.get_http_client") as mock_get_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
+            mock_get_client.return_value = mock_instance
 
             tokens = await refresh_access_token(
                 service_name="dataverse",
@@ -243,12 +239,10 @@ class TestNonJsonErrorResponses:
         # Simulate json() raising an error when response is HTML
         mock_response.json.side_effect = json.JSONDecodeError("Expecting value", "", 0)
 
-        with patch("httpx.AsyncClient") as mock_client:
+        with patch("app.services.oauth_token.get_http_client") as mock_get_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
+            mock_get_client.return_value = mock_instance
 
             with pytest.raises(OAuthTokenError) as exc_info:
                 await exchange_code_for_tokens(
@@ -272,12 +266,10 @@ class TestNonJsonErrorResponses:
         mock_response.text = ""
         mock_response.json.side_effect = json.JSONDecodeError("Expecting value", "", 0)
 
-        with patch("httpx.AsyncClient") as mock_client:
+        with patch("app.services.oauth_token.get_http_client") as mock_get_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
+            mock_get_client.return_value = mock_instance
 
             with pytest.raises(OAuthTokenError) as exc_info:
                 await exchange_code_for_tokens(
@@ -301,12 +293,10 @@ class TestNonJsonErrorResponses:
         mock_response.text = "<html>Service Unavailable</html>"
         mock_response.json.side_effect = json.JSONDecodeError("Expecting value", "", 0)
 
-        with patch("httpx.AsyncClient") as mock_client:
+        with patch("app.services.oauth_token.get_http_client") as mock_get_client:
             mock_instance = AsyncMock()
             mock_instance.post.return_value = mock_response
-            mock_instance.__aenter__.return_value = mock_instance
-            mock_instance.__aexit__.return_value = None
-            mock_client.return_value = mock_instance
+            mock_get_client.return_value = mock_instance
 
             with pytest.raises(OAuthTokenError) as exc_info:
                 await refresh_access_token(
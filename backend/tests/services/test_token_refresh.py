@@ -4,13 +4,30 @@ Tests for token refresh service.
 Following TDD: These tests are written BEFORE the implementation.
 """
 
-import os
+import asyncio
+
 import pytest
 from datetime import datetime, timezone, timedelta
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import patch
 from sqlmodel import Session
 
+from cryptography.fernet import InvalidToken
+
+from app.crud.integration import (
+    create_or_update_integration,
+    get_decrypted_tokens,
+    get_user_integration,
+)
 from app.models import User
+from app.services.oauth_token import OAuthTokenError
+from app.services.token_refresh import (
+    RATE_LIMIT_SECONDS,
+    REFRESH_LOCK_TIMEOUT_SECONDS,
+    get_refresh_threshold_minutes,
+    get_valid_token,
+    refresh_integration_token,
+    sweep_expiring_tokens,
+)
 
 
 class TestGetValidToken:
@@ -19,11 +36,6 @@ class TestGetValidToken:
     @pytest.mark.asyncio
     async def test_get_valid_token_returns_token_when_valid(self, session: Session):
         """Returns existing token when it's still valid."""
-        os.environ["GOOGLE_CLIENT_ID"] = "test-client-id"
-        os.environ["GOOGLE_CLIENT_SECRET"] = "test-client-secret"
-
-        from app.crud.integration import create_or_update_integration
-        from app.services.token_refresh import get_valid_token
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)
@@ -51,11 +63,6 @@ class TestGetValidToken:
     @pytest.mark.asyncio
     async def test_get_valid_token_refreshes_expired(self, session: Session):
         """Refreshes and returns new token when expired."""
-        os.environ["GOOGLE_CLIENT_ID"] = "test-client-id"
-        os.environ["GOOGLE_CLIENT_SECRET"] = "test-client-secret"
-
-        from app.crud.integration import create_or_update_integration, get_user_integration
-        from app.services.token_refresh import get_valid_token
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)
@@ -92,16 +99,11 @@ class TestGetValidToken:
             )
 
             assert token == "test-token-new"
-            mock_refresh.assert_called_once()
+        mock_refresh.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_get_valid_token_refreshes_expiring_soon(self, session: Session):
         """Refreshes token when expiring within 5 minutes."""
-        os.environ["GOOGLE_CLIENT_ID"] = "test-client-id"
-        os.environ["GOOGLE_CLIENT_SECRET"] = "test-client-secret"
-
-        from app.crud.integration import create_or_update_integration
-        from app.services.token_refresh import get_valid_token
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)
@@ -134,14 +136,11 @@ class TestGetValidToken:
 
             # Should have refreshed because expiring soon
             assert token == "refreshed-token"
-            mock_refresh.assert_called_once()
+        mock_refresh.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_get_valid_token_returns_none_on_decrypt_failure(self, session: Session):
         """Returns None when stored token cannot be decrypted (key mismatch)."""
-        from cryptography.fernet import InvalidToken
-        from app.crud.integration import create_or_update_integration
-        from app.services.token_refresh import get_valid_token
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)
@@ -171,7 +170,6 @@ class TestGetValidToken:
     @pytest.mark.asyncio
     async def test_get_valid_token_returns_none_for_missing(self, session: Session):
         """Returns None when integration doesn't exist."""
-        from app.services.token_refresh import get_valid_token
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)
@@ -189,11 +187,6 @@ class TestGetValidToken:
     @pytest.mark.asyncio
     async def test_get_valid_token_returns_none_when_no_refresh_token(self, session: Session):
         """Returns None when expired and no refresh token available."""
-        os.environ["GOOGLE_CLIENT_ID"] = "test-client-id"
-        os.environ["GOOGLE_CLIENT_SECRET"] = "test-client-secret"
-
-        from app.crud.integration import create_or_update_integration
-        from app.services.token_refresh import get_valid_token
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)
@@ -230,11 +223,6 @@ class TestRefreshIntegrationToken:
     @pytest.mark.asyncio
     async def test_refresh_integration_token_updates_stored_token(self, session: Session):
         """Refreshing updates the stored token in database."""
-        os.environ["GOOGLE_CLIENT_ID"] = "test-client-id"
-        os.environ["GOOGLE_CLIENT_SECRET"] = "test-client-secret"
-
-        from app.crud.integration import create_or_update_integration, get_user_integration, get_decrypted_tokens
-        from app.services.token_refresh import refresh_integration_token
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)
@@ -276,12 +264,6 @@ class TestRefreshIntegrationToken:
     @pytest.mark.asyncio
     async def test_refresh_integration_token_handles_failure(self, session: Session):
         """Handles refresh failure gracefully."""
-        os.environ["GOOGLE_CLIENT_ID"] = "test-client-id"
-        os.environ["GOOGLE_CLIENT_SECRET"] = "test-client-secret"
-
-        from app.crud.integration import create_or_update_integration
-        from app.services.token_refresh import refresh_integration_token
-        from app.services.oauth_token import OAuthTokenError
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)
@@ -316,21 +298,18 @@ class TestServiceSpecificRefreshThreshold:
 
     def test_get_refresh_threshold_google_drive(self):
         """Google Drive uses 5-minute threshold for short operations."""
-        from app.services.token_refresh import get_refresh_threshold_minutes
 
         threshold = get_refresh_threshold_minutes("google_drive")
         assert threshold == 5
 
     def test_get_refresh_threshold_dataverse(self):
         """Dataverse uses 60-minute threshold for long-running tasks."""
-        from app.services.token_refresh import get_refresh_threshold_minutes
 
         threshold = get_refresh_threshold_minutes("dataverse")
         assert threshold == 60
 
     def test_get_refresh_threshold_unknown_service(self):
         """Unknown services use default 5-minute threshold."""
-        from app.services.token_refresh import get_refresh_threshold_minutes
 
         threshold = get_refresh_threshold_minutes("unknown_service")
         assert threshold == 5  # Default value
@@ -341,9 +320,6 @@ class TestServiceSpecificRefreshThreshold:
         # Dataverse uses dynamic registration, no static credentials needed
         # Only DATAVERSE_AUTH_URL is required (set in conftest.py)
 
-        from app.crud.integration import create_or_update_integration
-        from app.services.token_refresh import get_valid_token
-
         user = User(email="test@example.com", username="testuser")
         session.add(user)
         session.commit()
@@ -377,16 +353,11 @@ class TestServiceSpecificRefreshThreshold:
 
             # Should have refreshed because expiring within 60-min threshold
             assert token == "refreshed-dataverse-token"
-            mock_refresh.assert_called_once()
+        mock_refresh.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_google_drive_does_not_refresh_at_30_minutes(self, session: Session):
         """Google Drive does NOT refresh when 30 minutes remaining (outside 5-min threshold)."""
-        os.environ["GOOGLE_CLIENT_ID"] = "test-client-id"
-        os.environ["GOOGLE_CLIENT_SECRET"] = "test-client-secret"
-
-        from app.crud.integration import create_or_update_integration
-        from app.services.token_refresh import get_valid_token
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)
@@ -422,11 +393,6 @@ class TestRefreshRaceCondition:
     @pytest.mark.asyncio
     async def test_refresh_skipped_when_lock_held(self, session: Session):
         """Refresh is skipped when another refresh is in progress (lock held)."""
-        os.environ["GOOGLE_CLIENT_ID"] = "test-client-id"
-        os.environ["GOOGLE_CLIENT_SECRET"] = "test-client-secret"
-
-        from app.crud.integration import create_or_update_integration
-        from app.services.token_refresh import refresh_integration_token
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)
@@ -471,11 +437,6 @@ class TestRefreshRaceCondition:
     @pytest.mark.asyncio
     async def test_refresh_proceeds_when_lock_expired(self, session: Session):
         """Refresh proceeds when the lock has expired (stale lock)."""
-        os.environ["GOOGLE_CLIENT_ID"] = "test-client-id"
-        os.environ["GOOGLE_CLIENT_SECRET"] = "test-client-secret"
-
-        from app.crud.integration import create_or_update_integration
-        from app.services.token_refresh import refresh_integration_token, REFRESH_LOCK_TIMEOUT_SECONDS
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)
@@ -516,16 +477,11 @@ class TestRefreshRaceCondition:
 
             # Should succeed
             assert result is True
-            mock_refresh.assert_called_once()
+        mock_refresh.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_refresh_clears_lock_on_success(self, session: Session):
         """Lock is cleared after successful refresh."""
-        os.environ["GOOGLE_CLIENT_ID"] = "test-client-id"
-        os.environ["GOOGLE_CLIENT_SECRET"] = "test-client-secret"
-
-        from app.crud.integration import create_or_update_integration, get_user_integration
-        from app.services.token_refresh import refresh_integration_token
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)
@@ -570,12 +526,6 @@ class TestRefreshRaceCondition:
     @pytest.mark.asyncio
     async def test_refresh_clears_lock_on_failure(self, session: Session):
         """Lock is cleared even if refresh fails."""
-        os.environ["GOOGLE_CLIENT_ID"] = "test-client-id"
-        os.environ["GOOGLE_CLIENT_SECRET"] = "test-client-secret"
-
-        from app.crud.integration import create_or_update_integration, get_user_integration
-        from app.services.token_refresh import refresh_integration_token
-        from app.services.oauth_token import OAuthTokenError
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)
@@ -614,17 +564,178 @@ class TestRefreshRaceCondition:
         assert integration.refresh_locked_at is None
 
 
+class TestInProcessRefreshCoalescing:
+    """Tests for coalescing concurrent in-process refreshes."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_coalesce_to_one_oauth_call(self, session: Session):
+        """Concurrent refreshes for the same (user, service) make one OAuth call."""
+
+        user = User(email="test@example.com", username="testuser")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+
+        # Create integration with expired token
+        integration = create_or_update_integration(
+            session=session,
+            user_id=user.id,
+            service_name="google_drive",
+            access_token="expired-token",  # noqa
+            refresh_token="refresh-token",
+            expires_in=3600,
+        )
+
+        integration.expires_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        session.add(integration)
+        session.commit()
+
+        with patch("app.services.token_refresh.refresh_access_token") as mock_refresh:
+            async def slow_refresh(**kwargs):
+                # Yield to the event loop so the other coroutines get a chance
+                # to race before the first refresh completes
+                await asyncio.sleep(0.01)
+                return {
+                    "access_token": "new-token",
+                    "refresh_token": "new-refresh-token",
+                    "expires_in": 3600,
+                }
+
+            mock_refresh.side_effect = slow_refresh
+
+            # One session per coroutine, modeling FastAPI's per-request
+            # sessions, each with the integration already loaded and held
+            # (as get_valid_token does before deciding to refresh). A
+            # waiter must observe the winner's commit through the
+            # database, not through a shared identity map.
+            task_sessions = [Session(session.get_bind()) for _ in range(3)]
+            preloaded = [
+                get_user_integration(
+                    session=task_session,
+                    user_id=user.id,
+                    service_name="google_drive",
+                )
+                for task_session in task_sessions
+            ]
+            assert all(preloaded)
+
+            try:
+                results = await asyncio.gather(
+                    *[
+                        refresh_integration_token(
+                            session=task_session,
+                            user_id=user.id,
+                            service_name="google_drive",
+                        )
+                        for task_session in task_sessions
+                    ]
+                )
+            finally:
+                for task_session in task_sessions:
+                    task_session.close()
+
+        # Only one coroutine should have reached the OAuth provider;
+        # the others were coalesced (and then skipped by rate limiting)
+        mock_refresh.assert_called_once()
+        assert results.count(True) == 1
+
+
+class TestSweepExpiringTokens:
+    """Tests for the background token refresh sweeper."""
+
+    @pytest.mark.asyncio
+    async def test_sweep_refreshes_expired_tokens(self, session: Session):
+        """Sweeper refreshes tokens that are expired or expiring soon."""
+
+        user = User(email="test@example.com", username="testuser")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+
+        # Expired token - should be refreshed
+        integration = create_or_update_integration(
+            session=session,
+            user_id=user.id,
+            service_name="google_drive",
+            access_token="expired-token",  # noqa
+            refresh_token="refresh-token",
+            expires_in=3600,
+        )
+        integration.expires_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        session.add(integration)
+        session.commit()
+
+        with patch("app.services.token_refresh.refresh_access_token") as mock_refresh:
+            mock_refresh.return_value = {
+                "access_token": "new-token",
+                "refresh_token": "new-refresh-token",
+                "expires_in": 3600,
+            }
+
+            refreshed = await sweep_expiring_tokens(session=session)
+
+        assert refreshed == 1
+        mock_refresh.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_sweep_skips_valid_tokens(self, session: Session):
+        """Sweeper ignores tokens that are not near expiry."""
+
+        user = User(email="test@example.com", username="testuser")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+
+        # Valid for 2 hours - outside every service threshold
+        create_or_update_integration(
+            session=session,
+            user_id=user.id,
+            service_name="google_drive",
+            access_token="still-valid-token",  # noqa
+            refresh_token="refresh-token",
+            expires_in=7200,
+        )
+
+        with patch("app.services.token_refresh.refresh_access_token") as mock_refresh:
+            refreshed = await sweep_expiring_tokens(session=session)
+
+        assert refreshed == 0
+        mock_refresh.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_sweep_skips_tokens_without_refresh_token(self, session: Session):
+        """Sweeper ignores expired tokens that have no refresh token."""
+
+        user = User(email="test@example.com", username="testuser")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+
+        integration = create_or_update_integration(
+            session=session,
+            user_id=user.id,
+            service_name="google_drive",
+            access_token="expired-token",  # noqa
+            refresh_token=None,
+            expires_in=3600,
+        )
+        integration.expires_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        session.add(integration)
+        session.commit()
+
+        with patch("app.services.token_refresh.refresh_access_token") as mock_refresh:
+            refreshed = await sweep_expiring_tokens(session=session)
+
+        assert refreshed == 0
+        mock_refresh.assert_not_called()
+
+
 class TestRefreshRateLimiting:
     """Tests for rate limiting on token refresh."""
 
     @pytest.mark.asyncio
     async def test_refresh_skipped_when_recently_attempted(self, session: Session):
         """Refresh is skipped if attempted too recently."""
-        os.environ["GOOGLE_CLIENT_ID"] = "test-client-id"
-        os.environ["GOOGLE_CLIENT_SECRET"] = "test-client-secret"
-
-        from app.crud.integration import create_or_update_integration
-        from app.services.token_refresh import refresh_integration_token, RATE_LIMIT_SECONDS
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)
@@ -667,11 +778,6 @@ class TestRefreshRateLimiting:
     @pytest.mark.asyncio
     async def test_refresh_proceeds_after_rate_limit_expires(self, session: Session):
         """Refresh proceeds after rate limit period has passed."""
-        os.environ["GOOGLE_CLIENT_ID"] = "test-client-id"
-        os.environ["GOOGLE_CLIENT_SECRET"] = "test-client-secret"
-
-        from app.crud.integration import create_or_update_integration
-        from app.services.token_refresh import refresh_integration_token, RATE_LIMIT_SECONDS
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)
@@ -711,16 +817,11 @@ class TestRefreshRateLimiting:
 
             # Should succeed
             assert result is True
-            mock_refresh.assert_called_once()
+        mock_refresh.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_refresh_updates_last_attempt_timestamp(self, session: Session):
         """Last refresh attempt timestamp is updated on attempt."""
-        os.environ["GOOGLE_CLIENT_ID"] = "test-client-id"
-        os.environ["GOOGLE_CLIENT_SECRET"] = "test-client-secret"
-
-        from app.crud.integration import create_or_update_integration, get_user_integration
-        from app.services.token_refresh import refresh_integration_token
 
         user = User(email="test@example.com", username="testuser")
         session.add(user)